@@ -4,6 +4,7 @@ Core module for the Cardano arbitrage bot.
 Structure:
     core/
     ├── types.py          # Token, Asset
+    ├── plutus.py         # Plutus datum decoding helpers
     ├── blockchain/       # Ogmios client
     ├── pools/            # Pool handlers
     ├── orders/           # Order parsers
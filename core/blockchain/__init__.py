@@ -1,3 +1,17 @@
-from .ogmios_client import OgmiosClient
+from .ogmios_client import (
+    ChainTip,
+    OgmiosClient,
+    OgmiosConnectionError,
+    OgmiosError,
+    OgmiosQueryError,
+    get_shared_client,
+)
 
-__all__ = ["OgmiosClient"]
+__all__ = [
+    "OgmiosClient",
+    "ChainTip",
+    "OgmiosError",
+    "OgmiosConnectionError",
+    "OgmiosQueryError",
+    "get_shared_client",
+]
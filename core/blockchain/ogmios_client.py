@@ -5,21 +5,79 @@ import base64
 import json
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
-import websockets
-from websockets.client import WebSocketClientProtocol
+from websockets.asyncio.client import ClientConnection, connect
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "OgmiosClient",
+    "ChainTip",
+    "OgmiosError",
+    "OgmiosConnectionError",
+    "OgmiosQueryError",
+    "get_shared_client",
+]
 
-@dataclass
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        # Decode to str so requests still go out as text frames
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+    _loads_buffer = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib
+    _dumps = json.dumps
+    _loads = json.loads
+
+    def _loads_buffer(view: memoryview) -> Any:
+        return json.loads(bytes(view))
+
+
+# Pre-serialized envelopes for the hot paths; everything else goes through _dumps
+_BARE_TEMPLATES: Dict[str, str] = {}  # method -> envelope with only the id left to format
+_UTXO_PREFIX = '{"jsonrpc":"2.0","method":"queryLedgerState/utxo","params":{"addresses":["'
+_UTXO_SUFFIX = '"]},"id":%d}'
+
+
+def _encode_request(method: str, params: Optional[Dict[str, Any]], request_id: int) -> str:
+    """Serialize a JSON-RPC request, splicing the id into a template when possible."""
+    if not params:
+        template = _BARE_TEMPLATES.get(method)
+        if template is None:
+            template = _BARE_TEMPLATES[method] = '{"jsonrpc":"2.0","method":"' + method + '","id":%d}'
+        return template % request_id
+    if method == "queryLedgerState/utxo" and params.keys() == {"addresses"}:
+        addresses = params["addresses"]
+        # Bech32 addresses are plain alphanumerics, so they need no JSON escaping
+        if addresses and all(a.isalnum() and a.isascii() for a in addresses):
+            return _UTXO_PREFIX + '","'.join(addresses) + _UTXO_SUFFIX % request_id
+    request = {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+    return _dumps(request)
+
+
+@dataclass(frozen=True, slots=True)
 class ChainTip:
     slot: int
     block_hash: str
     block_height: Optional[int] = None
 
 
+def _parse_tip_v6(r: Dict[str, Any]) -> ChainTip:
+    return ChainTip(slot=r["slot"], block_hash=r["id"], block_height=r.get("height"))
+
+
+def _parse_tip_legacy(r: Dict[str, Any]) -> ChainTip:
+    return ChainTip(
+        slot=r.get("slot", r.get("slotNo", 0)),
+        block_hash=r.get("id", r.get("hash", r.get("headerHash", ""))),
+        block_height=r.get("height", r.get("blockNo")),
+    )
+
+
 class OgmiosError(Exception):
     """Base exception for Ogmios errors."""
 
@@ -33,28 +91,65 @@ class OgmiosQueryError(OgmiosError):
 class OgmiosClient:
     """Async client for Ogmios WebSocket API (v5 and v6)."""
     
-    def __init__(self, url: str = "ws://localhost:1337", username: Optional[str] = None, password: Optional[str] = None):
+    def __init__(
+        self,
+        url: str = "ws://localhost:1337",
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        max_inflight: int = 64,
+    ):
         self.url = url
         self.username = username
         self.password = password
-        self._ws: Optional[WebSocketClientProtocol] = None
+        self._auth_header: Optional[Dict[str, str]] = None
+        if username and password:
+            encoded = base64.b64encode(f"{username}:{password}".encode()).decode()
+            self._auth_header = {"Authorization": f"Basic {encoded}"}
+        self._ws: Optional[ClientConnection] = None
         self._request_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._recv_buf = bytearray()  # Reassembly buffer for fragmented responses, grown on demand
+        # Bound concurrent requests so the reader keeps up; the high-water mark helps tune the limit
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self._inflight_count = 0
+        self._inflight_high_water = 0
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()  # One dial at a time (callers vs. the reconnect loop)
+        self._owned = True  # False for the process-wide shared client (see get_shared_client)
+        # Tip method/parser for the server's Ogmios version, discovered on first get_chain_tip
+        self._tip_method: Optional[str] = None
+        self._tip_parser: Callable[[Dict[str, Any]], ChainTip] = _parse_tip_v6
     
     def _get_headers(self) -> Dict[str, str]:
-        if self.username and self.password:
-            encoded = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
-            return {"Authorization": f"Basic {encoded}"}
-        return {}
+        return self._auth_header or {}
     
     async def connect(self) -> bool:
         """Connect to Ogmios. Returns True on success."""
+        async with self._connect_lock:
+            if self.is_connected:
+                return True
+            if self._ws or self._reader:
+                await self._close()  # Reader died but the socket may still be open
+            return await self._connect()
+    
+    async def _connect(self) -> bool:
         try:
             headers = self._get_headers()
-            # Increase max_size to handle large UTxO responses (50MB)
-            connect_kwargs = {"max_size": 50 * 1024 * 1024}
+            # Increase max_size to handle large UTxO responses (50MB).
+            # No permessage-deflate: Ogmios is usually local, where zlib costs more than it saves.
+            connect_kwargs = {
+                "max_size": 50 * 1024 * 1024,
+                "compression": None,
+                "ping_interval": 20,
+                "ping_timeout": 20,
+                "max_queue": 64,
+                "write_limit": 2 ** 20,
+            }
             if headers:
                 connect_kwargs["additional_headers"] = headers
-            self._ws = await websockets.connect(self.url, **connect_kwargs)
+            self._ws = await connect(self.url, **connect_kwargs)
+            self._reader = asyncio.create_task(self._read_loop())
             logger.info(f"Connected to Ogmios at {self.url}")
             return True
         except ConnectionRefusedError:
@@ -65,14 +160,29 @@ class OgmiosClient:
             return False
     
     async def disconnect(self):
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        await self._close()
+    
+    async def _close(self):
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        self._fail_pending(OgmiosConnectionError("Disconnected from Ogmios"))
         if self._ws:
             await self._ws.close()
             self._ws = None
             logger.info("Disconnected from Ogmios")
     
+    @property
+    def inflight_high_water(self) -> int:
+        """Most requests ever awaiting a response at once."""
+        return self._inflight_high_water
+    
     @property
     def is_connected(self) -> bool:
-        return self._ws is not None and self._ws.open
+        return self._ws is not None and self._reader is not None and not self._reader.done()
     
     async def __aenter__(self):
         if not await self.connect():
@@ -80,28 +190,99 @@ class OgmiosClient:
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.disconnect()
+        if self._owned:
+            await self.disconnect()
+    
+    async def _reconnect_loop(self, interval: float = 5.0):
+        """Redial whenever the connection drops."""
+        while True:
+            await asyncio.sleep(interval)
+            if not self.is_connected:
+                logger.warning(f"Lost connection to Ogmios, reconnecting to {self.url}")
+                await self.connect()
     
     def _next_request_id(self) -> int:
         self._request_id += 1
         return self._request_id
     
-    async def _send_request(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: float = 30.0) -> Dict[str, Any]:
-        """Send JSON-RPC request and wait for response."""
-        if not self._ws:
+    async def _read_loop(self):
+        """Route every incoming response (single or batched) to the future awaiting its id."""
+        try:
+            while True:
+                message = await self._recv_message()
+                for response in message if isinstance(message, list) else [message]:
+                    future = self._pending.pop(response.get("id"), None)
+                    if future and not future.done():
+                        future.set_result(response)
+                    elif future is None:
+                        logger.debug(f"Dropping response with unknown id: {response.get('id')}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ogmios connection lost: {e}")
+            self._fail_pending(OgmiosConnectionError(f"Connection lost: {e}"))
+    
+    async def _recv_message(self) -> Any:
+        """Receive and parse one message, reassembling fragments in a reused buffer."""
+        # Raw bytes skip the UTF-8 decode to str; the JSON parser validates as it reads
+        first = None
+        size = 0
+        buf = self._recv_buf
+        async for chunk in self._ws.recv_streaming(decode=False):
+            if first is None:
+                first = chunk
+                continue
+            if not size:
+                buf[:len(first)] = first
+                size = len(first)
+            buf[size:size + len(chunk)] = chunk  # Overwrites in place, extends past the end
+            size += len(chunk)
+        if not size:
+            return _loads(first)
+        with memoryview(buf)[:size] as view:  # Released so the buffer can grow next time
+            return _loads_buffer(view)
+    
+    def _fail_pending(self, error: Exception):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+                future.exception()  # Mark retrieved: prefetched requests may have no awaiter
+        self._pending.clear()
+    
+    async def _submit(self, method: str, params: Optional[Dict[str, Any]] = None) -> asyncio.Future:
+        """Send JSON-RPC request without waiting. Returns a future resolving to the raw response."""
+        if not self.is_connected:
             raise OgmiosConnectionError("Not connected to Ogmios")
         
-        request = {"jsonrpc": "2.0", "method": method, "id": self._next_request_id()}
-        if params:
-            request["params"] = params
+        request_id = self._next_request_id()
         
+        future = asyncio.get_running_loop().create_future()
+        # Forget the id once settled (incl. cancellation on timeout) so late responses are dropped
+        future.add_done_callback(lambda _: self._pending.pop(request_id, None))
+        self._pending[request_id] = future
         try:
-            await self._ws.send(json.dumps(request))
-            response = json.loads(await asyncio.wait_for(self._ws.recv(), timeout=timeout))
-        except asyncio.TimeoutError:
-            raise OgmiosQueryError(f"Request timed out after {timeout}s: {method}")
+            await self._ws.send(_encode_request(method, params, request_id))
         except Exception as e:
+            self._pending.pop(request_id, None)
             raise OgmiosQueryError(f"Request failed: {e}")
+        return future
+    
+    async def _send_request(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: float = 30.0) -> Any:
+        """Send JSON-RPC request and wait for response."""
+        async with self._inflight:
+            self._inflight_count += 1
+            self._inflight_high_water = max(self._inflight_high_water, self._inflight_count)
+            try:
+                future = await self._submit(method, params)
+                response = await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                raise OgmiosQueryError(f"Request timed out after {timeout}s: {method}")
+            except OgmiosError:
+                raise
+            except Exception as e:
+                raise OgmiosQueryError(f"Request failed: {e}")
+            finally:
+                self._inflight_count -= 1
         
         if "result" in response:
             return response["result"]
@@ -111,16 +292,20 @@ class OgmiosClient:
         return response
     
     async def get_chain_tip(self) -> ChainTip:
-        """Query current chain tip."""
+        """Query current chain tip. The working method and response shape are probed once, then reused."""
+        if self._tip_method:
+            r = await self._send_request(self._tip_method)
+            if isinstance(r, dict):
+                return self._tip_parser(r)
+            raise OgmiosQueryError(f"Unexpected chain tip response: {r}")
+        
         for method in ["queryLedgerState/tip", "queryNetwork/tip"]:
             try:
                 r = await self._send_request(method)
                 if isinstance(r, dict):
-                    return ChainTip(
-                        slot=r.get("slot", r.get("slotNo", 0)),
-                        block_hash=r.get("id", r.get("hash", r.get("headerHash", ""))),
-                        block_height=r.get("height", r.get("blockNo")),
-                    )
+                    self._tip_method = method
+                    self._tip_parser = _parse_tip_v6 if "slot" in r and "id" in r else _parse_tip_legacy
+                    return self._tip_parser(r)
             except OgmiosQueryError:
                 continue
         raise OgmiosQueryError("Failed to query chain tip")
@@ -140,6 +325,24 @@ class OgmiosClient:
         result = await self._send_request("queryLedgerState/utxo", {"addresses": addresses})
         return result if isinstance(result, list) else []
     
+    async def iter_utxos_by_addresses(self, addresses: List[str], chunk_size: int = 32) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Query addresses in concurrent chunks, yielding each chunk's UTxOs as soon as it arrives.
+        
+        Lets callers convert/parse early chunks while later ones are still in flight.
+        """
+        chunks = [addresses[i:i + chunk_size] for i in range(0, len(addresses), chunk_size)]
+        tasks = [asyncio.create_task(self._send_request("queryLedgerState/utxo", {"addresses": c})) for c in chunks]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                yield result if isinstance(result, list) else []
+        finally:
+            # Consumer stopped early or a chunk failed: don't leave the rest running unobserved
+            for task in tasks:
+                if not task.cancel() and not task.cancelled():
+                    task.exception()  # mark already-finished failures as retrieved
+    
     async def get_utxos_by_output_references(self, output_refs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         result = await self._send_request("queryLedgerState/utxo", {"outputReferences": output_refs})
         return result if isinstance(result, list) else []
@@ -154,3 +357,25 @@ class OgmiosClient:
             return {"status": "healthy", "connected": True, "chain_tip": {"slot": tip.slot, "block_hash": tip.block_hash, "block_height": tip.block_height}}
         except Exception as e:
             return {"status": "unhealthy", "connected": False, "error": str(e)}
+
+
+_shared_clients: Dict[str, OgmiosClient] = {}
+
+
+async def get_shared_client(settings) -> OgmiosClient:
+    """
+    Get the process-wide OgmiosClient for settings.ogmios_url.
+    
+    Connects once and reconnects in the background if the connection drops,
+    so callers skip the per-use handshake. Leaving `async with` does not close it.
+    """
+    client = _shared_clients.get(settings.ogmios_url)
+    if client is None:
+        client = OgmiosClient(settings.ogmios_url, settings.ogmios_username, settings.ogmios_password)
+        client._owned = False
+        _shared_clients[settings.ogmios_url] = client
+    if not await client.connect():
+        raise OgmiosConnectionError(f"Failed to connect to {client.url}")
+    if client._reconnect_task is None or client._reconnect_task.done():
+        client._reconnect_task = asyncio.create_task(client._reconnect_loop())
+    return client
@@ -0,0 +1,66 @@
+"""Small LRU cache for memoizing parsed chain data."""
+
+from collections import OrderedDict
+from typing import Any, ClassVar, Generic, Hashable, List, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """
+    Bounded mapping that evicts the least recently used entry.
+    
+    Not thread-safe - intended for use from a single asyncio event loop.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+    
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+    
+    def put(self, key: Hashable, value: V):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        return self._data.pop(key, default)
+    
+    def keys(self) -> List[Hashable]:
+        return list(self._data)
+    
+    def clear(self):
+        self._data.clear()
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DatumCacheMixin:
+    """
+    Per-instance LRU of decoded datums keyed by their CBOR bytes.
+    
+    Shared by pool handlers and order parsers; subclasses implement parse_datum().
+    Cached datums are shared between calls, so callers must only read them.
+    """
+    DATUM_CACHE_SIZE: ClassVar[int] = 1024
+    
+    def __init__(self):
+        self._datums: LRUCache[Any] = LRUCache(self.DATUM_CACHE_SIZE)
+    
+    def _parse_datum_cached(self, datum_cbor: bytes) -> Any:
+        datum = self._datums.get(datum_cbor)
+        if datum is None:
+            datum = self.parse_datum(datum_cbor)
+            self._datums.put(datum_cbor, datum)
+        return datum
@@ -9,7 +9,7 @@ class ChainClient(Protocol):
     
     UTxO dict structure:
         {"tx_hash": str, "output_index": int, "value": {...},
-         "datum_cbor": Optional[str], "datum_hash": Optional[str], "script_hash": Optional[str]}
+         "datum_cbor": Optional[bytes], "datum_hash": Optional[str], "script_hash": Optional[str]}
     """
     
     async def get_utxos_by_scripts(self, script_hashes: List[str]) -> List[dict]:
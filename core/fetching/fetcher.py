@@ -1,12 +1,14 @@
 """Pool and order fetching from chain."""
 
-from typing import List, Optional
+from typing import List, Optional, Set
+import asyncio
 import logging
 
+from core.cache import LRUCache
 from core.types import Token
-from core.pools import get_handler, all_handlers
+from core.pools import get_handler, nft_to_handler
 from core.pools.base import Pool, PoolHandler
-from core.orders import get_parser, all_parsers
+from core.orders import get_parser, script_to_parser
 from core.orders.base import Order, OrderParser
 from .client import ChainClient
 
@@ -16,8 +18,14 @@ logger = logging.getLogger(__name__)
 class Fetcher:
     """Fetches pools and orders from chain using any ChainClient implementation."""
     
-    def __init__(self, client: ChainClient):
+    def __init__(self, client: ChainClient, cache_size: int = 4096):
         self.client = client
+        # Registries are static, so snapshot the reverse lookups once
+        self._nft_to_handler = nft_to_handler()
+        self._script_to_parser = script_to_parser()
+        # Datums are content-addressed, so entries never go stale. Parsed pools/orders are
+        # mutable and returned fresh each fetch; handlers/parsers cache the decoded datums.
+        self._datum_cache: LRUCache[bytes] = LRUCache(cache_size)
     
     async def fetch_pools(
         self,
@@ -25,27 +33,43 @@ class Fetcher:
         token: Optional[Token] = None,
     ) -> List[Pool]:
         """Fetch pools, optionally filtered by type or token."""
-        handlers = [h for h in (get_handler(t) for t in pool_types) if h] if pool_types else all_handlers()
-        if not handlers:
-            return []
-        
-        # Build NFT → handler lookup
-        nft_to_handler = {nft: h for h in handlers for nft in h.nft_policies}
-        
-        pools = []
-        for nft_policy, handler in nft_to_handler.items():
-            for utxo in await self.client.get_utxos_by_nft(nft_policy):
-                pool = await self._try_parse_pool(utxo, handler)
-                if pool and (not token or pool.contains_token(token)):
-                    pools.append(pool)
-        return pools
+        pools = await self._fetch_pools(pool_types, {token} if token else None)
+        return [p for p in pools if not token or p.contains_token(token)]
     
     async def fetch_pools_for_pair(self, token_a: Token, token_b: Token) -> List[Pool]:
         """Fetch all pools for a specific token pair."""
-        pair = {token_a, token_b}
-        return [p for p in await self.fetch_pools() if {p.token_a, p.token_b} == pair]
+        return [
+            p for p in await self._fetch_pools(None, {token_a, token_b})
+            if (p.token_a == token_a and p.token_b == token_b) or (p.token_a == token_b and p.token_b == token_a)
+        ]
     
-    async def _try_parse_pool(self, utxo: dict, handler: PoolHandler) -> Optional[Pool]:
+    async def _fetch_pools(self, pool_types: Optional[List[str]], tokens: Optional[Set[Token]]) -> List[Pool]:
+        nft_to_handler = self._nft_to_handler
+        if pool_types:
+            handlers = [h for h in (get_handler(t) for t in pool_types) if h]
+            nft_to_handler = {nft: h for nft, h in nft_to_handler.items() if h in handlers}
+        if not nft_to_handler:
+            return []
+        
+        # Query all NFT policies concurrently, then parse (and fetch datums) concurrently
+        utxo_lists = await asyncio.gather(*(self.client.get_utxos_by_nft(nft) for nft in nft_to_handler))
+        # A UTxO can carry NFTs from several policies (e.g. legacy + current); parse it once
+        seen = set()
+        coros = []
+        for handler, utxos in zip(nft_to_handler.values(), utxo_lists):
+            for utxo in utxos:
+                key = (utxo["tx_hash"], utxo["output_index"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                coros.append(self._try_parse_pool(utxo, handler, tokens))
+        parsed = await asyncio.gather(*coros)
+        return [p for p in parsed if p]
+    
+    async def _try_parse_pool(self, utxo: dict, handler: PoolHandler, tokens: Optional[Set[Token]] = None) -> Optional[Pool]:
+        # Skip pools whose value can't hold the wanted tokens before touching the datum
+        if tokens and (pair := handler.pool_tokens_from_value(utxo)) and not tokens.issubset(pair):
+            return None
         if not handler.is_pool_utxo(utxo):
             return None
         datum_cbor = await self._get_datum_cbor(utxo)
@@ -59,26 +83,28 @@ class Fetcher:
     
     async def fetch_orders(self, order_types: Optional[List[str]] = None) -> List[Order]:
         """Fetch orders, optionally filtered by type."""
-        parsers = [p for p in (get_parser(t) for t in order_types) if p] if order_types else all_parsers()
-        if not parsers:
+        script_to_parser = self._script_to_parser
+        if order_types:
+            parsers = [p for p in (get_parser(t) for t in order_types) if p]
+            script_to_parser = {s: p for s, p in script_to_parser.items() if p in parsers}
+        if not script_to_parser:
             return []
         
-        # Build script → parser lookup
-        script_to_parser = {s: p for p in parsers for s in p.script_hashes}
         utxos = await self.client.get_utxos_by_scripts(list(script_to_parser.keys()))
         
-        orders = []
-        for utxo in utxos:
-            script = utxo.get("script_hash") or utxo.get("address_script_hash", "")
-            if parser := script_to_parser.get(script):
-                if order := await self._try_parse_order(utxo, parser):
-                    orders.append(order)
-        return orders
+        parsed = await asyncio.gather(*(
+            self._try_parse_order(utxo, parser)
+            for utxo in utxos
+            if (parser := script_to_parser.get(utxo.get("script_hash") or utxo.get("address_script_hash", "")))
+        ))
+        return [o for o in parsed if o]
     
     async def fetch_orders_for_pair(self, token_a: Token, token_b: Token) -> List[Order]:
         """Fetch all orders for a specific token pair."""
-        pair = {token_a, token_b}
-        return [o for o in await self.fetch_orders() if {o.bid_token, o.ask_token} == pair]
+        return [
+            o for o in await self.fetch_orders()
+            if (o.bid_token == token_a and o.ask_token == token_b) or (o.bid_token == token_b and o.ask_token == token_a)
+        ]
     
     async def fetch_matchable_orders(self, pool: Pool) -> List[Order]:
         """Fetch orders that can be matched with a specific pool."""
@@ -98,8 +124,13 @@ class Fetcher:
     
     async def _get_datum_cbor(self, utxo: dict) -> Optional[bytes]:
         """Get datum CBOR from UTxO (inline or by hash)."""
-        if utxo.get("datum_cbor"):
-            return bytes.fromhex(utxo["datum_cbor"])
-        if utxo.get("datum_hash"):
-            return await self.client.get_datum(utxo["datum_hash"])
+        if (datum_cbor := utxo.get("datum_cbor")) is not None:
+            return datum_cbor
+        if datum_hash := utxo.get("datum_hash"):
+            if (cached := self._datum_cache.get(datum_hash)) is not None:
+                return cached
+            datum_cbor = await self.client.get_datum(datum_hash)
+            if datum_cbor:
+                self._datum_cache.put(datum_hash, datum_cbor)
+            return datum_cbor
         return None
@@ -3,7 +3,7 @@
 from typing import List, Optional, Dict
 import logging
 
-from core.blockchain import OgmiosClient
+from core.blockchain import OgmiosClient, get_shared_client
 
 logger = logging.getLogger(__name__)
 
@@ -19,17 +19,24 @@ class OgmiosChainClient:
         self.ogmios = ogmios
         self._script_to_address: Dict[str, str] = {}
     
+    @classmethod
+    async def shared(cls, settings) -> "OgmiosChainClient":
+        """Adapter over the process-wide shared OgmiosClient (see get_shared_client)."""
+        return cls(await get_shared_client(settings))
+    
     def register_address(self, script_hash: str, address: str):
         """Register script hash → address mapping."""
         self._script_to_address[script_hash] = address
     
     async def get_utxos_by_scripts(self, script_hashes: List[str]) -> List[dict]:
         """Fetch UTxOs at registered script addresses."""
+        address_to_script = {a: s for s in script_hashes if (a := self._script_to_address.get(s))}
+        if not address_to_script:
+            return []
+        
         utxos = []
-        for script_hash in script_hashes:
-            if address := self._script_to_address.get(script_hash):
-                raw = await self.ogmios.get_utxos_by_address(address)
-                utxos.extend(self._convert(raw, script_hash))
+        async for raw in self.ogmios.iter_utxos_by_addresses(list(address_to_script)):
+            utxos.extend(self._convert(raw, address_to_script))
         return utxos
     
     async def get_utxos_by_nft(self, policy_id: str) -> List[dict]:
@@ -41,14 +48,17 @@ class OgmiosChainClient:
         """Not supported - use inline datums."""
         return None
     
-    def _convert(self, ogmios_utxos: List[dict], script_hash: str) -> List[dict]:
-        """Convert Ogmios UTxO format to standard format."""
+    def _convert(self, ogmios_utxos: List[dict], address_to_script: Dict[str, str]) -> List[dict]:
+        """Convert Ogmios UTxO format to standard format (inline datum decoded to bytes once here)."""
+        # transaction/index/address/value are always present in Ogmios v6 UTxOs, so index them directly
+        fromhex = bytes.fromhex
+        script_for = address_to_script.get
         return [{
-            "tx_hash": u.get("transaction", {}).get("id", ""),
-            "output_index": u.get("index", 0),
-            "address": u.get("address", ""),
-            "value": u.get("value", {}),
-            "datum_cbor": u.get("datum"),
+            "tx_hash": u["transaction"]["id"],
+            "output_index": u["index"],
+            "address": (addr := u["address"]),
+            "value": u["value"],
+            "datum_cbor": fromhex(d) if (d := u.get("datum")) else None,
             "datum_hash": u.get("datumHash"),
-            "script_hash": script_hash,
+            "script_hash": script_for(addr),
         } for u in ogmios_utxos]
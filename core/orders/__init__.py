@@ -1,8 +1,8 @@
 """Order parsers for all supported DEXes."""
 
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
-from .base import Order, OrderParser, BaseOrder, BaseOrderParser, ExecutionResult, CancellationInputs
+from .base import Order, OrderParser, BaseOrder, BaseOrderParser, ExecutionResult, CancellationInputs, SimulationCache
 from .plutus_common import (
     PlutusAddress, PlutusToken, PubKeyHash, StakingOuter, NoStakingCredential,
     create_plutus_address, create_plutus_token, from_hex,
@@ -21,13 +21,14 @@ PARSERS: Dict[str, OrderParser] = {
 
 # Build script → type mapping
 _SCRIPT_TO_TYPE = {s: t for t, p in PARSERS.items() for s in p.script_hashes}
+_SCRIPT_TO_PARSER = {s: p for p in PARSERS.values() for s in p.script_hashes}
 
 
 def get_parser(order_type: str) -> Optional[OrderParser]:
     return PARSERS.get(order_type)
 
-def get_parser_for_script(script_hash: str) -> Optional[OrderParser]:
-    return PARSERS.get(_SCRIPT_TO_TYPE.get(script_hash))
+# Per-output dispatch on the sync hot path: a single dict lookup
+get_parser_for_script: Callable[[str], Optional[OrderParser]] = _SCRIPT_TO_PARSER.get
 
 def all_parsers() -> List[OrderParser]:
     return list(PARSERS.values())
@@ -35,11 +36,16 @@ def all_parsers() -> List[OrderParser]:
 def all_script_hashes() -> List[str]:
     return list(_SCRIPT_TO_TYPE.keys())
 
+def script_to_parser() -> Dict[str, OrderParser]:
+    return dict(_SCRIPT_TO_PARSER)
+
 
 __all__ = [
     "Order", "OrderParser", "BaseOrder", "BaseOrderParser", "ExecutionResult", "CancellationInputs",
+    "SimulationCache",
     "PlutusAddress", "PlutusToken", "PubKeyHash", "StakingOuter", "NoStakingCredential",
     "create_plutus_address", "create_plutus_token", "from_hex",
     "MinswapV1Order", "MinswapV1OrderParser", "MinswapV1OrderDatum", "create_minswap_v1_order_datum",
     "PARSERS", "get_parser", "get_parser_for_script", "all_parsers", "all_script_hashes",
+    "script_to_parser",
 ]
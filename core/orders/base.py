@@ -2,15 +2,16 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import ClassVar, List, Optional, Protocol, runtime_checkable
+from typing import ClassVar, Dict, FrozenSet, List, Optional, Protocol, Tuple, runtime_checkable
 
 from pycardano import PlutusData, Address, Redeemer, TransactionOutput, Value
 
+from core.cache import DatumCacheMixin
 from core.types import Token, Asset
 from core.pools.base import Pool
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of simulating order execution against a pool."""
     output_amount: int
@@ -41,7 +42,7 @@ class Order(Protocol):
     def would_satisfy(self, pool: Pool) -> bool: ...
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseOrder(ABC):
     """
     Base class for DEX orders.
@@ -81,7 +82,9 @@ class BaseOrder(ABC):
         """Check if order can match with pool (type and token pair)."""
         if pool.pool_type != self.POOL_TYPE:
             return False
-        return {pool.token_a, pool.token_b} == {self.bid_token, self.ask_token}
+        bid, ask = self.bid_asset.token, self.ask_asset.token
+        a, b = pool.token_a, pool.token_b
+        return (a == bid and b == ask) or (a == ask and b == bid)
     
     def simulate(self, pool: Pool) -> ExecutionResult:
         """Simulate execution against a pool."""
@@ -96,6 +99,35 @@ class BaseOrder(ABC):
         return f"{self.__class__.__name__}({self.bid_asset} → {self.ask_asset})"
 
 
+class SimulationCache:
+    """
+    Memoizes order-vs-pool simulations for one matching pass.
+    
+    Keyed by the order and pool UTxO ids plus the pool's current reserves, so
+    pools whose reserves are updated in place (e.g. during a simulated route) miss.
+    Call clear() at each block boundary to bound memory.
+    """
+    
+    def __init__(self):
+        self._results: Dict[Tuple[str, str, int, int], ExecutionResult] = {}
+    
+    def simulate(self, order: Order, pool: Pool) -> ExecutionResult:
+        key = (order.utxo_id, pool.utxo_id, pool.reserve_a, pool.reserve_b)
+        result = self._results.get(key)
+        if result is None:
+            result = self._results[key] = order.simulate(pool)
+        return result
+    
+    def would_satisfy(self, order: Order, pool: Pool) -> bool:
+        return order.can_match_pool(pool) and self.simulate(order, pool).satisfies_min
+    
+    def clear(self):
+        self._results.clear()
+    
+    def __len__(self) -> int:
+        return len(self._results)
+
+
 class OrderParser(Protocol):
     """Protocol for order parsers."""
     order_type: str
@@ -105,7 +137,7 @@ class OrderParser(Protocol):
     def parse_order(self, utxo: dict, datum_cbor: bytes, utxo_id: str) -> Optional["BaseOrder"]: ...
 
 
-class BaseOrderParser(ABC):
+class BaseOrderParser(DatumCacheMixin, ABC):
     """
     Base class for order parsers.
     
@@ -113,6 +145,11 @@ class BaseOrderParser(ABC):
     """
     ORDER_TYPE: ClassVar[str] = ""
     SCRIPT_HASHES: ClassVar[List[str]] = []
+    _SCRIPT_HASHES_SET: ClassVar[FrozenSet[str]] = frozenset()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._SCRIPT_HASHES_SET = frozenset(cls.SCRIPT_HASHES)
     
     @property
     def order_type(self) -> str:
@@ -125,12 +162,12 @@ class BaseOrderParser(ABC):
     def is_order_utxo(self, utxo: dict) -> bool:
         """Check if UTxO is an order based on script hash."""
         script_hash = utxo.get("script_hash") or utxo.get("address_script_hash", "")
-        return script_hash in self.SCRIPT_HASHES
+        return script_hash in self._SCRIPT_HASHES_SET
     
     def parse_order(self, utxo: dict, datum_cbor: bytes, utxo_id: str) -> Optional[BaseOrder]:
         """Parse order from UTxO and datum CBOR. Returns None if parsing fails."""
         try:
-            return self.create_order(utxo, self.parse_datum(datum_cbor), utxo_id)
+            return self.create_order(utxo, self._parse_datum_cached(datum_cbor), utxo_id)
         except Exception:
             return None
     
@@ -148,20 +185,20 @@ class BaseOrderParser(ABC):
     ) -> Asset:
         """Extract bid asset from UTxO (highest amount non-ADA token, or ADA minus fees)."""
         value = utxo.get("value", {})
-        ada_amount = value.get("ada", {}).get("lovelace", 0)
-        ignore_policies = ignore_policies or []
+        ignore_policies = ignore_policies or ()
         
-        # Collect non-ADA assets
-        non_ada = [
-            Asset(amount=amt, token=Token(policy_id=pid, name=name))
-            for pid, assets in value.items()
-            if pid != "ada" and pid not in ignore_policies
-            for name, amt in assets.items()
-            if amt > 0
-        ]
+        # Single pass for the largest non-ADA amount (first wins on ties); build the Asset once
+        best_amount, best_pid, best_name = 0, None, None
+        for pid, assets in value.items():
+            if pid == "ada" or pid in ignore_policies:
+                continue
+            for name, amt in assets.items():
+                if amt > best_amount:
+                    best_amount, best_pid, best_name = amt, pid, name
         
-        if non_ada:
-            return max(non_ada, key=lambda a: a.amount)
+        if best_pid is not None:
+            return Asset(amount=best_amount, token=Token.get(best_pid, best_name))
+        ada_amount = value.get("ada", {}).get("lovelace", 0)
         return Asset(amount=max(0, ada_amount - subtract_lovelace), token=Token.ada())
 
 
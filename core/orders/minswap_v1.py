@@ -3,11 +3,13 @@
 from dataclasses import dataclass
 from typing import ClassVar, Optional, Union
 
+from cbor2 import loads as cbor_loads
 from pycardano import PlutusData, Address, Redeemer, PlutusV1Script, TransactionOutput, Value
 
+from core.plutus import constr_fields
 from core.types import Token, Asset
 from .base import BaseOrder, BaseOrderParser, CancellationInputs
-from .plutus_common import from_hex, StakingOuter, PlutusAddress, create_plutus_address
+from .plutus_common import from_hex, PlutusAddress, create_plutus_address, decode_plutus_address
 
 # Constants
 ORDER_TYPE = "minswap-v1"
@@ -47,7 +49,18 @@ class MinswapV1OrderDatum(PlutusData):
     CONSTR_ID: ClassVar[int] = 0
 
 
-@dataclass
+def _decode_order_datum(datum_cbor: bytes) -> MinswapV1OrderDatum:
+    """Decode the common order datum shape directly, skipping pycardano's generic schema walk."""
+    sender, receiver, receiver_datum_hash, buy_asset, batcher_fee, deposit = constr_fields(cbor_loads(datum_cbor), 6)
+    constr_fields(receiver_datum_hash, 0, constr_id=1)  # Only the EmptyDatum case is fast-pathed
+    token, amount = constr_fields(buy_asset, 2)
+    return MinswapV1OrderDatum(
+        decode_plutus_address(sender), decode_plutus_address(receiver), EmptyDatum(),
+        BuyAsset(BuyToken(*constr_fields(token, 2)), amount), batcher_fee, deposit,
+    )
+
+
+@dataclass(slots=True)
 class MinswapV1Order(BaseOrder):
     """Minswap V1 swap order."""
     ORDER_TYPE: ClassVar[str] = ORDER_TYPE
@@ -60,16 +73,16 @@ class MinswapV1OrderParser(BaseOrderParser):
     SCRIPT_HASHES: ClassVar[list] = [ORDER_SCRIPT_HASH]
     
     def parse_datum(self, datum_cbor: bytes) -> MinswapV1OrderDatum:
-        return MinswapV1OrderDatum.from_cbor(datum_cbor)
+        try:
+            return _decode_order_datum(datum_cbor)
+        except Exception:  # Unusual encoding (e.g. receiver datum hash set) - let pycardano handle it
+            return MinswapV1OrderDatum.from_cbor(datum_cbor)
     
     def create_order(self, utxo: dict, datum: MinswapV1OrderDatum, utxo_id: str) -> MinswapV1Order:
         sender = self._extract_address(datum.sender_address)
         beneficiary = self._extract_address(datum.receiver_address)
         
-        ask_token = Token(
-            policy_id=datum.buy_asset.token.policy_id.hex(),
-            name=datum.buy_asset.token.token_name.hex()
-        )
+        ask_token = Token.from_bytes(datum.buy_asset.token.policy_id, datum.buy_asset.token.token_name)
         bid_asset = self.extract_bid_asset_from_utxo(utxo, datum.batcher_fee + datum.deposit)
         
         return MinswapV1Order(
@@ -81,8 +94,9 @@ class MinswapV1OrderParser(BaseOrderParser):
     
     def _extract_address(self, addr: PlutusAddress) -> tuple[str, Optional[str]]:
         pkh = addr.pub_key_hash.pub_key_hash.hex()
-        skh = addr.staking_outer.staking_inner.staking_cred_hash.staking_cred_hash.hex() \
-            if isinstance(addr.staking_outer, StakingOuter) else None
+        outer = addr.staking_outer
+        # Constructor 0 is StakingOuter (Just), 1 is NoStakingCredential (Nothing)
+        skh = outer.staking_inner.staking_cred_hash.staking_cred_hash.hex() if outer.CONSTR_ID == 0 else None
         return (pkh, skh)
 
 
@@ -3,8 +3,11 @@
 from dataclasses import dataclass
 from typing import ClassVar, Union
 
+from cbor2 import CBORTag
 from pycardano import PlutusData, Address
 
+from core.plutus import constr_fields
+
 
 def from_hex(hex_string: str) -> bytes:
     """Convert hex string to bytes. Returns empty bytes for empty/None input."""
@@ -71,6 +74,18 @@ class PlutusToken(PlutusData):
     CONSTR_ID: ClassVar[int] = 0
 
 
+# Fast decoding of cbor2-decoded datums
+def decode_plutus_address(obj) -> PlutusAddress:
+    """Build a PlutusAddress (pub key payment part) from its cbor2-decoded form."""
+    payment, staking = constr_fields(obj, 2)
+    pkh = PubKeyHash(*constr_fields(payment, 1))
+    if staking.__class__ is CBORTag and staking.tag == 122 and not staking.value:
+        return PlutusAddress(pkh, NoStakingCredential())
+    (inner,) = constr_fields(staking, 1)
+    (cred,) = constr_fields(inner, 1)
+    return PlutusAddress(pkh, StakingOuter(StakingInner(StakingCredentialHash(*constr_fields(cred, 1)))))
+
+
 # Helper functions
 def create_staking_credential(address: Address) -> Union[StakingOuter, NoStakingCredential]:
     """Create staking credential wrapper from PyCardano Address."""
@@ -0,0 +1,11 @@
+"""Helpers for Plutus data shared by pool handlers and order parsers."""
+
+from cbor2 import CBORTag
+
+
+# Fast decoding of cbor2-decoded datums (constructor N is tag 121 + N for N < 7)
+def constr_fields(obj, n: int, constr_id: int = 0) -> list:
+    """Fields of a Plutus constructor value, checking its tag and arity."""
+    if obj.__class__ is not CBORTag or obj.tag != 121 + constr_id or len(obj.value) != n:
+        raise ValueError("Unexpected datum shape")
+    return obj.value
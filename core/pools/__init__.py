@@ -1,11 +1,14 @@
 """Pool handlers for all supported DEXes."""
 
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from .base import Pool, PoolHandler, BasePool, BasePoolHandler
+from .table import PoolTable
 from .minswap_v1 import (
     MinswapV1Pool, MinswapV1PoolHandler, MinswapV1PoolDatum,
     handler as minswap_v1_handler,
+    pool_out_many as minswap_v1_pool_out_many,
+    best_pool as minswap_v1_best_pool,
     POOL_SCRIPT_HASH as MINSWAP_V1_SCRIPT,
     POOL_NFT_POLICY as MINSWAP_V1_NFT,
 )
@@ -18,16 +21,16 @@ HANDLERS: Dict[str, PoolHandler] = {
 # Build script/NFT → type mappings
 _SCRIPT_TO_TYPE = {s: t for t, h in HANDLERS.items() for s in h.script_hashes}
 _NFT_TO_TYPE = {n: t for t, h in HANDLERS.items() for n in h.nft_policies}
+_SCRIPT_TO_HANDLER = {s: h for h in HANDLERS.values() for s in h.script_hashes}
+_NFT_TO_HANDLER = {n: h for h in HANDLERS.values() for n in h.nft_policies}
 
 
 def get_handler(pool_type: str) -> Optional[PoolHandler]:
     return HANDLERS.get(pool_type)
 
-def get_handler_for_script(script_hash: str) -> Optional[PoolHandler]:
-    return HANDLERS.get(_SCRIPT_TO_TYPE.get(script_hash))
-
-def get_handler_for_nft(policy_id: str) -> Optional[PoolHandler]:
-    return HANDLERS.get(_NFT_TO_TYPE.get(policy_id))
+# Per-output dispatch on the sync hot path: a single dict lookup
+get_handler_for_script: Callable[[str], Optional[PoolHandler]] = _SCRIPT_TO_HANDLER.get
+get_handler_for_nft: Callable[[str], Optional[PoolHandler]] = _NFT_TO_HANDLER.get
 
 def all_handlers() -> List[PoolHandler]:
     return list(HANDLERS.values())
@@ -38,10 +41,14 @@ def all_script_hashes() -> List[str]:
 def all_nft_policies() -> List[str]:
     return list(_NFT_TO_TYPE.keys())
 
+def nft_to_handler() -> Dict[str, PoolHandler]:
+    return dict(_NFT_TO_HANDLER)
+
 
 __all__ = [
-    "Pool", "PoolHandler", "BasePool", "BasePoolHandler",
+    "Pool", "PoolHandler", "BasePool", "BasePoolHandler", "PoolTable",
     "MinswapV1Pool", "MinswapV1PoolHandler", "MinswapV1PoolDatum",
     "HANDLERS", "get_handler", "get_handler_for_script", "get_handler_for_nft",
-    "all_handlers", "all_script_hashes", "all_nft_policies",
+    "all_handlers", "all_script_hashes", "all_nft_policies", "nft_to_handler",
+    "minswap_v1_pool_out_many", "minswap_v1_best_pool",
 ]
@@ -0,0 +1,33 @@
+"""Shared AMM math for pool implementations. Exact integer arithmetic (matches on-chain validators)."""
+
+from typing import List, Tuple
+
+
+def constant_product_out(r_in: int, r_out: int, amount_in: int, fee_num: int, fee_den: int) -> int:
+    """output = (amount_in * fee_num * r_out) / (r_in * fee_den + amount_in * fee_num)"""
+    amt_with_fee = amount_in * fee_num
+    return (amt_with_fee * r_out) // (r_in * fee_den + amt_with_fee)
+
+
+def constant_product_in(r_in: int, r_out: int, amount_out: int, fee_num: int, fee_den: int) -> int:
+    """input = (r_in * amount_out * fee_den) / ((r_out - amount_out) * fee_num) + 1"""
+    return (r_in * amount_out * fee_den) // ((r_out - amount_out) * fee_num) + 1
+
+
+def constant_product_out_many(
+    reserves: List[Tuple[int, int]], amount_in: int, fee_num: int, fee_den: int
+) -> List[int]:
+    """constant_product_out for one input amount across many (r_in, r_out) pairs."""
+    amt_with_fee = amount_in * fee_num
+    return [(amt_with_fee * r_out) // (r_in * fee_den + amt_with_fee) for r_in, r_out in reserves]
+
+
+def best_constant_product_out(
+    reserves: List[Tuple[int, int]], amount_in: int, fee_num: int, fee_den: int
+) -> Tuple[int, int]:
+    """(index, output) of the pair giving the largest output, or (-1, 0) if none."""
+    outputs = constant_product_out_many(reserves, amount_in, fee_num, fee_den)
+    if not outputs:
+        return -1, 0
+    best = max(range(len(outputs)), key=outputs.__getitem__)
+    return best, outputs[best]
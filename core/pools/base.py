@@ -2,11 +2,11 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from decimal import Decimal
-from typing import ClassVar, List, Optional, Protocol, runtime_checkable
+from typing import ClassVar, FrozenSet, List, Optional, Protocol, runtime_checkable
 
 from pycardano import PlutusData
 
+from core.cache import DatumCacheMixin
 from core.types import Token
 
 
@@ -20,20 +20,20 @@ class Pool(Protocol):
     token_b: Token
     reserve_a: int
     reserve_b: int
-    fee: Decimal
+    fee: float
     
     def pool_out(self, input_token: Token, input_amount: int) -> int: ...
     def pool_in(self, output_token: Token, output_amount: int) -> int: ...
-    def price(self, base_token: Token) -> Decimal: ...
+    def price(self, base_token: Token) -> float: ...
     def contains_token(self, token: Token) -> bool: ...
     def other_token(self, token: Token) -> Token: ...
 
 
-@dataclass
+@dataclass(slots=True)
 class BasePool(ABC):
     """Base class for DEX pools."""
     POOL_TYPE: ClassVar[str] = ""
-    FEE: ClassVar[Decimal] = Decimal("0")
+    FEE: ClassVar[float] = 0.0  # Fraction of input, e.g. 0.003 for 0.3%
     
     pool_id: str
     token_a: Token
@@ -47,7 +47,7 @@ class BasePool(ABC):
         return self.POOL_TYPE
     
     @property
-    def fee(self) -> Decimal:
+    def fee(self) -> float:
         return self.FEE
     
     @abstractmethod
@@ -60,12 +60,12 @@ class BasePool(ABC):
         """Calculate required input for desired output."""
         ...
     
-    def price(self, base_token: Token) -> Decimal:
+    def price(self, base_token: Token) -> float:
         """Spot price of quote token in terms of base token."""
         if base_token == self.token_a:
-            return Decimal(self.reserve_b) / Decimal(self.reserve_a) if self.reserve_a else Decimal(0)
+            return self.reserve_b / self.reserve_a if self.reserve_a else 0.0
         if base_token == self.token_b:
-            return Decimal(self.reserve_a) / Decimal(self.reserve_b) if self.reserve_b else Decimal(0)
+            return self.reserve_a / self.reserve_b if self.reserve_b else 0.0
         raise ValueError(f"Token {base_token} not in pool")
     
     def contains_token(self, token: Token) -> bool:
@@ -94,16 +94,23 @@ class PoolHandler(Protocol):
     nft_policies: List[str]
     
     def is_pool_utxo(self, utxo: dict) -> bool: ...
+    def pool_tokens_from_value(self, utxo: dict) -> Optional[tuple[Token, Token]]: ...
     def parse_pool(self, utxo: dict, datum_cbor: bytes, utxo_id: str) -> Optional[Pool]: ...
 
 
-class BasePoolHandler(ABC):
+class BasePoolHandler(DatumCacheMixin, ABC):
     """Base class for pool handlers."""
     POOL_TYPE: ClassVar[str] = ""
     SCRIPT_HASHES: ClassVar[List[str]] = []
     NFT_POLICIES: ClassVar[List[str]] = []
     IGNORED_POLICIES: ClassVar[List[str]] = []
     MIN_POOL_ADA: ClassVar[int] = 4_000_000
+    # Set view of NFT_POLICIES + IGNORED_POLICIES for membership tests, derived per subclass
+    _EXCLUDED_POLICIES_SET: ClassVar[FrozenSet[str]] = frozenset()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._EXCLUDED_POLICIES_SET = frozenset(cls.NFT_POLICIES + cls.IGNORED_POLICIES)
     
     @property
     def pool_type(self) -> str:
@@ -120,6 +127,7 @@ class BasePoolHandler(ABC):
     def extract_pool_nft_id(self, utxo: dict) -> Optional[str]:
         """Extract pool NFT asset name from UTxO (returns None if not a pool)."""
         value = utxo.get("value", {})
+        # Ordered scan: NFT_POLICIES order decides which NFT wins when a UTxO carries several
         for policy in self.NFT_POLICIES:
             if policy in value:
                 for name, amount in value[policy].items():
@@ -131,10 +139,30 @@ class BasePoolHandler(ABC):
         """Check if UTxO is a pool (has NFT with amount 1)."""
         return self.extract_pool_nft_id(utxo) is not None
     
+    def pool_tokens_from_value(self, utxo: dict) -> Optional[tuple[Token, Token]]:
+        """
+        Infer the pool's token pair from its UTxO value without decoding the datum.
+        
+        A single non-ADA asset (besides NFT/ignored policies) means an ADA pair.
+        Returns None if the value doesn't look like a pair.
+        """
+        ignored = self._EXCLUDED_POLICIES_SET
+        tokens = [
+            Token.get(pid, name)
+            for pid, assets in utxo.get("value", {}).items()
+            if pid != "ada" and pid not in ignored
+            for name in assets
+        ]
+        if len(tokens) == 2:
+            return tokens[0], tokens[1]
+        if len(tokens) == 1:
+            return Token.ada(), tokens[0]
+        return None
+    
     def parse_pool(self, utxo: dict, datum_cbor: bytes, utxo_id: str) -> Optional[BasePool]:
         """Parse pool from UTxO and datum CBOR. Returns None if parsing fails."""
         try:
-            return self.create_pool(utxo, self.parse_datum(datum_cbor), utxo_id)
+            return self.create_pool(utxo, self._parse_datum_cached(datum_cbor), utxo_id)
         except Exception:
             return None
     
@@ -147,23 +175,11 @@ class BasePoolHandler(ABC):
     def extract_reserves(self, utxo: dict, token_a: Token, token_b: Token) -> tuple[int, int]:
         """Extract (reserve_a, reserve_b) from UTxO value."""
         value = utxo.get("value", {})
+        # ADA only counts as a reserve above the pool's minimum (the rest is min-UTxO padding)
         ada_amount = value.get("ada", {}).get("lovelace", 0)
-        ignored = set(self.NFT_POLICIES + self.IGNORED_POLICIES)
-        
-        reserve_a, reserve_b = 0, 0
-        for policy_id, assets in value.items():
-            if policy_id == "ada" or policy_id in ignored:
-                continue
-            for asset_name, amount in assets.items():
-                if policy_id == token_a.policy_id and asset_name == token_a.name:
-                    reserve_a = amount
-                elif policy_id == token_b.policy_id and asset_name == token_b.name:
-                    reserve_b = amount
+        pool_ada = ada_amount if ada_amount >= self.MIN_POOL_ADA else 0
         
-        # Handle ADA as token
-        if token_a.is_ada and ada_amount >= self.MIN_POOL_ADA:
-            reserve_a = ada_amount
-        elif token_b.is_ada and ada_amount >= self.MIN_POOL_ADA:
-            reserve_b = ada_amount
+        reserve_a = pool_ada if token_a.is_ada else value.get(token_a.policy_id, {}).get(token_a.name, 0)
+        reserve_b = pool_ada if token_b.is_ada else value.get(token_b.policy_id, {}).get(token_b.name, 0)
         
         return reserve_a, reserve_b
@@ -1,12 +1,14 @@
 """Minswap V1 pool implementation - constant product AMM with 0.3% fee."""
 
 from dataclasses import dataclass
-from decimal import Decimal
-from typing import ClassVar, Optional
+from typing import ClassVar, List, Optional, Tuple
 
+from cbor2 import loads as cbor_loads
 from pycardano import PlutusData
 
+from core.plutus import constr_fields
 from core.types import Token
+from .amm import best_constant_product_out, constant_product_in, constant_product_out, constant_product_out_many
 from .base import BasePool, BasePoolHandler
 
 # Constants
@@ -16,6 +18,7 @@ POOL_NFT_POLICY = "0be55d262b29f564998ff81efe21bdc0022621c12f15af08d0f2ddb1"
 POOL_TOKEN_POLICY = "13aa2accf2e1561723aa26871e071fdf32c867cff7e7d50ad470d62f"
 LP_TOKEN_POLICY = "e4214b7cce62ac6fbba385d164df48e157eae5863521b4b67ca71d86"
 FEE_NUM, FEE_DEN = 997, 1000  # 0.3% fee
+MAX_IN = 10**18  # pool_in result when the output would drain the pool
 
 
 # Datum structures
@@ -36,30 +39,46 @@ class MinswapV1PoolDatum(PlutusData):
     CONSTR_ID: ClassVar[int] = 0
 
 
-@dataclass
+def _decode_pool_datum(datum_cbor: bytes) -> MinswapV1PoolDatum:
+    """Decode the fixed pool datum shape directly, skipping pycardano's generic schema walk."""
+    token_a, token_b, total_liquidity, root_k_last = constr_fields(cbor_loads(datum_cbor), 4)
+    return MinswapV1PoolDatum(
+        PoolToken(*constr_fields(token_a, 2)), PoolToken(*constr_fields(token_b, 2)), total_liquidity, root_k_last,
+    )
+
+
+@dataclass(slots=True)
 class MinswapV1Pool(BasePool):
     """Minswap V1 constant product AMM pool (x * y = k)."""
     POOL_TYPE: ClassVar[str] = POOL_TYPE
-    FEE: ClassVar[Decimal] = Decimal("0.3")
+    FEE: ClassVar[float] = 0.003
     
     def pool_out(self, input_token: Token, input_amount: int) -> int:
         """output = (input * 997 * reserve_out) / (reserve_in * 1000 + input * 997)"""
         r_in, r_out = self.get_reserves(input_token)
-        amt_with_fee = input_amount * FEE_NUM
-        return (amt_with_fee * r_out) // (r_in * FEE_DEN + amt_with_fee)
+        return constant_product_out(r_in, r_out, input_amount, FEE_NUM, FEE_DEN)
     
     def pool_in(self, output_token: Token, output_amount: int) -> int:
         """input = (reserve_in * output * 1000) / ((reserve_out - output) * 997) + 1"""
-        if output_token == self.token_a:
-            r_in, r_out = self.reserve_b, self.reserve_a
-        elif output_token == self.token_b:
-            r_in, r_out = self.reserve_a, self.reserve_b
-        else:
-            raise ValueError(f"Token {output_token} not in pool")
-        
+        r_out, r_in = self.get_reserves(output_token)  # Reserves as seen from the output side
         if output_amount >= r_out:
-            return int(1e18)
-        return (r_in * output_amount * FEE_DEN) // ((r_out - output_amount) * FEE_NUM) + 1
+            return MAX_IN
+        return constant_product_in(r_in, r_out, output_amount, FEE_NUM, FEE_DEN)
+
+
+def pool_out_many(pools: List[MinswapV1Pool], input_token: Token, input_amount: int) -> List[int]:
+    """Output of swapping the same input into each pool, in one pass."""
+    return constant_product_out_many(
+        [p.get_reserves(input_token) for p in pools], input_amount, FEE_NUM, FEE_DEN
+    )
+
+
+def best_pool(pools: List[MinswapV1Pool], input_token: Token, input_amount: int) -> Optional[Tuple[MinswapV1Pool, int]]:
+    """Pool giving the largest output for the input, with that output; None if no pools."""
+    i, output = best_constant_product_out(
+        [p.get_reserves(input_token) for p in pools], input_amount, FEE_NUM, FEE_DEN
+    )
+    return (pools[i], output) if i >= 0 else None
 
 
 class MinswapV1PoolHandler(BasePoolHandler):
@@ -70,11 +89,14 @@ class MinswapV1PoolHandler(BasePoolHandler):
     IGNORED_POLICIES: ClassVar[list] = [POOL_TOKEN_POLICY, LP_TOKEN_POLICY]
     
     def parse_datum(self, datum_cbor: bytes) -> MinswapV1PoolDatum:
-        return MinswapV1PoolDatum.from_cbor(datum_cbor)
+        try:
+            return _decode_pool_datum(datum_cbor)
+        except Exception:  # Unusual encoding - let pycardano handle (or reject) it
+            return MinswapV1PoolDatum.from_cbor(datum_cbor)
     
     def create_pool(self, utxo: dict, datum: MinswapV1PoolDatum, utxo_id: str) -> Optional[MinswapV1Pool]:
-        token_a = Token(policy_id=datum.token_a.policy_id.hex(), name=datum.token_a.token_name.hex())
-        token_b = Token(policy_id=datum.token_b.policy_id.hex(), name=datum.token_b.token_name.hex())
+        token_a = Token.from_bytes(datum.token_a.policy_id, datum.token_a.token_name)
+        token_b = Token.from_bytes(datum.token_b.policy_id, datum.token_b.token_name)
         
         pool_id = self.extract_pool_nft_id(utxo)
         if not pool_id:
@@ -0,0 +1,75 @@
+"""Column-oriented pool reserve table for scanning many pools at once."""
+
+from typing import Dict, List, Optional, Tuple
+
+from core.types import Token
+from .base import Pool
+
+
+class PoolTable:
+    """
+    Pool reserves stored as parallel columns, keyed by pool_id.
+    
+    Rows stay dense (removal swaps in the last row), so scans are plain list walks.
+    Pool objects are kept alongside for callers that need the full pool.
+    """
+    
+    def __init__(self):
+        self.pools: List[Pool] = []
+        self.token_a: List[Token] = []
+        self.token_b: List[Token] = []
+        self.reserve_a: List[int] = []
+        self.reserve_b: List[int] = []
+        self._rows: Dict[str, int] = {}
+    
+    def upsert(self, pool: Pool):
+        """Add a pool, or overwrite its row with the latest reserves."""
+        row = self._rows.get(pool.pool_id)
+        if row is None:
+            self._rows[pool.pool_id] = len(self.pools)
+            self.pools.append(pool)
+            self.token_a.append(pool.token_a)
+            self.token_b.append(pool.token_b)
+            self.reserve_a.append(pool.reserve_a)
+            self.reserve_b.append(pool.reserve_b)
+            return
+        self.pools[row] = pool
+        self.token_a[row] = pool.token_a
+        self.token_b[row] = pool.token_b
+        self.reserve_a[row] = pool.reserve_a
+        self.reserve_b[row] = pool.reserve_b
+    
+    def remove(self, pool_id: str) -> Optional[Pool]:
+        """Drop a pool's row. Returns the removed pool, or None if unknown."""
+        row = self._rows.pop(pool_id, None)
+        if row is None:
+            return None
+        removed = self.pools[row]
+        for column in (self.pools, self.token_a, self.token_b, self.reserve_a, self.reserve_b):
+            column[row] = column[-1]
+            column.pop()
+        if row < len(self.pools):
+            self._rows[self.pools[row].pool_id] = row
+        return removed
+    
+    def get(self, pool_id: str) -> Optional[Pool]:
+        row = self._rows.get(pool_id)
+        return self.pools[row] if row is not None else None
+    
+    def reserves_for(self, input_token: Token) -> Tuple[List[Pool], List[Tuple[int, int]]]:
+        """Pools accepting input_token with their (reserve_in, reserve_out), for amm batch helpers."""
+        pools, reserves = [], []
+        for i, (a, b) in enumerate(zip(self.token_a, self.token_b)):
+            if a == input_token:
+                pools.append(self.pools[i])
+                reserves.append((self.reserve_a[i], self.reserve_b[i]))
+            elif b == input_token:
+                pools.append(self.pools[i])
+                reserves.append((self.reserve_b[i], self.reserve_a[i]))
+        return pools, reserves
+    
+    def __contains__(self, pool_id: str) -> bool:
+        return pool_id in self._rows
+    
+    def __len__(self) -> int:
+        return len(self.pools)
@@ -1,8 +1,9 @@
 """Block iterator using Ogmios ChainSync protocol."""
 
 import asyncio
-import json
 import logging
+from collections import deque
+from contextlib import suppress
 from typing import Optional, AsyncIterator
 
 from core.blockchain import OgmiosClient
@@ -11,11 +12,19 @@ logger = logging.getLogger(__name__)
 
 
 class BlockIterator:
-    """Iterates blocks using Ogmios ChainSync (nextBlock method)."""
+    """
+    Iterates blocks using Ogmios ChainSync (nextBlock method).
     
-    def __init__(self, ogmios: OgmiosClient):
+    A background task keeps `pipeline_depth` nextBlock requests in flight and queues
+    responses in order, so network latency overlaps with the consumer's processing.
+    Call close() when done to stop it.
+    """
+    
+    def __init__(self, ogmios: OgmiosClient, pipeline_depth: int = 8):
         self.ogmios = ogmios
-        self._ws = None
+        self.pipeline_depth = pipeline_depth
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=pipeline_depth)
+        self._producer: Optional[asyncio.Task] = None
     
     async def init_connection(self, start_slot: Optional[int] = None, start_hash: Optional[str] = None):
         """
@@ -26,8 +35,7 @@ class BlockIterator:
         """
         if not self.ogmios.is_connected:
             await self.ogmios.connect()
-        
-        self._ws = self.ogmios._ws
+        await self.close()  # Re-init: stop any previous pipeline before moving the cursor
         
         # Get chain tip for intersection
         tip = await self.ogmios.get_chain_tip()
@@ -39,35 +47,42 @@ class BlockIterator:
             intersection_point = {"slot": tip.slot, "id": tip.block_hash}
         
         # Find intersection
-        request = {
-            "jsonrpc": "2.0",
-            "method": "findIntersection",
-            "params": {"points": [intersection_point]},
-            "id": self.ogmios._next_request_id(),
-        }
-        await self._ws.send(json.dumps(request))
-        response = json.loads(await self._ws.recv())
+        response = await (await self.ogmios._submit("findIntersection", {"points": [intersection_point]}))
         
-        if "error" in response or "No intersection found" in str(response):
+        if response.get("error") is not None or "intersection" not in (response.get("result") or {}):
             logger.warning(f"Could not find intersection, using tip")
             intersection_point = {"slot": tip.slot, "id": tip.block_hash}
-            request["params"]["points"][0] = intersection_point
-            await self._ws.send(json.dumps(request))
-            await self._ws.recv()  # Intersection response
+            await (await self.ogmios._submit("findIntersection", {"points": [intersection_point]}))
         
-        # Request first block (ChainSync protocol)
-        await self._request_next_block()
-        # Discard the intersection confirmation
-        await self._ws.recv()
+        self._queue = asyncio.Queue(maxsize=self.pipeline_depth)
+        self._producer = asyncio.create_task(self._produce())
     
-    async def _request_next_block(self):
-        """Request next block from ChainSync."""
-        request = {
-            "jsonrpc": "2.0",
-            "method": "nextBlock",
-            "id": self.ogmios._next_request_id(),
-        }
-        await self._ws.send(json.dumps(request))
+    async def _produce(self):
+        """Keep the nextBlock pipeline full and queue responses in request order."""
+        try:
+            in_flight = deque()
+            for _ in range(self.pipeline_depth):
+                in_flight.append(await self.ogmios._submit("nextBlock"))
+            # The first reply is the rollback to the intersection point itself, not a chain event
+            await in_flight.popleft()
+            in_flight.append(await self.ogmios._submit("nextBlock"))
+            while True:
+                response = await in_flight.popleft()
+                in_flight.append(await self.ogmios._submit("nextBlock"))
+                await self._queue.put(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Hand the failure to the consumer instead of dying silently
+            await self._queue.put(e)
+    
+    async def close(self):
+        """Stop the background nextBlock pipeline."""
+        if self._producer:
+            self._producer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._producer
+            self._producer = None
     
     async def iterate_blocks(self, max_blocks: Optional[int] = None) -> AsyncIterator[dict]:
         """
@@ -81,17 +96,15 @@ class BlockIterator:
             if max_blocks and count >= max_blocks:
                 break
             
-            response_str = await self._ws.recv()
-            response = json.loads(response_str)
+            response = await self._queue.get()
+            if isinstance(response, Exception):
+                raise response
             
             # Check for rollback
             if "result" in response and response["result"].get("direction") == "backward":
                 logger.warning("Rollback detected - stopping iteration")
                 break
             
-            # Request next block before yielding current
-            await self._request_next_block()
-            
             if "result" in response and "block" in response["result"]:
                 count += 1
                 yield response["result"]["block"]
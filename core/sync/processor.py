@@ -1,30 +1,70 @@
 """Process blocks to extract orders and pools."""
 
 import logging
-from typing import List, Dict, Any
-from decimal import Decimal
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional
 
-from core.orders import get_parser_for_script, all_parsers
-from core.pools import get_handler, all_handlers
-from core.types import Token
-from pycardano import Address
+from core.orders import OrderParser, get_parser_for_script
+from core.pools import PoolHandler, get_handler_for_script
+from core.types import OrderRecord, PoolRecord
+from pycardano.crypto.bech32 import bech32_decode, convertbits
 
 logger = logging.getLogger(__name__)
 
 # Known order contract addresses → script hashes
 # Minswap V1
-ORDER_ADDRESS_TO_SCRIPT = {
+ORDER_ADDRESS_TO_SCRIPT = MappingProxyType({
     "addr1zxn9efv2f6w82hagxqtn62ju4m293tqvw0uhmdl64ch8uw6j2c79gy9l76sdg0xwhd7r0c0kna0tycz4y5s6mlenh8pq6s3z70": 
         "c620c56751448d1a92184c8f506a4d1f31fc53e55fdd694c8bcda6fa",
-}
+})
+
+
+# Shelley address header types (upper nibble) whose payment part is a script hash
+_SCRIPT_PAYMENT_HEADERS = frozenset((0x1, 0x3, 0x5, 0x7))
+
+
+@lru_cache(maxsize=65536)
+def _decode_script_hash(address: str) -> Optional[str]:
+    """
+    Payment script hash of a bech32 address (memoized - contract addresses repeat a lot).
+    
+    Decodes only the header byte and the 28-byte payment part rather than building a pycardano Address.
+    """
+    _, data, _ = bech32_decode(address)
+    if not data:
+        return None  # Not bech32 (e.g. Byron) or bad checksum
+    raw = convertbits(data, 5, 8, False)
+    if not raw or len(raw) < 29 or (raw[0] >> 4) not in _SCRIPT_PAYMENT_HEADERS:
+        return None
+    return bytes(raw[1:29]).hex()
+
+
+# forkserver is POSIX-only; spawn works everywhere (e.g. Windows dev machines)
+_POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
 
 
 class BlockProcessor:
-    """Processes blocks to extract orders and pools."""
+    """
+    Processes blocks to extract orders and pools.
     
-    def __init__(self):
-        self.order_parsers = {p: p for p in all_parsers()}
-        self.pool_handlers = {h: h for h in all_handlers()}
+    Transactions are independent, so with workers > 1, blocks with at least
+    `parallel_threshold` candidate transactions are split across a process pool
+    (created on first use; forkserver, or spawn where that is unavailable). Pickling slices costs more than
+    the serial parse below ~100 candidates, so the pool is opt-in.
+    Call close() to shut the pool down.
+    """
+    
+    def __init__(self, workers: int = 1, parallel_threshold: int = 100):
+        # script hash -> parser/handler (single dict lookups, see core.orders / core.pools)
+        self._parser_for_script = get_parser_for_script
+        self._handler_for_script = get_handler_for_script
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
         self.stats = {
             "blocks_processed": 0,
             "orders_found": 0,
@@ -32,6 +72,12 @@ class BlockProcessor:
             "transactions_processed": 0,
         }
     
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+    
     def process_block(self, block: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process a single block and extract orders/pools.
@@ -43,17 +89,25 @@ class BlockProcessor:
         height = block.get("height", 0)
         transactions = block.get("transactions", [])
         
-        logger.info(f"Processing block {height} (slot {slot}), {len(transactions)} transactions")
+        # Runs once per block during backfill; skip building the message when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Processing block %d (slot %d), %d transactions", height, slot, len(transactions))
         
-        orders = []
-        pools = []
-        
-        for tx_idx, tx in enumerate(transactions):
-            tx_orders, tx_pools = self._process_transaction(block, tx_idx, tx)
-            orders.extend(tx_orders)
-            pools.extend(tx_pools)
-            self.stats["transactions_processed"] += 1
+        # Resolve each distinct datum-carrying address once; blocks with no DEX outputs stop here
+        script_for_address = self._resolve_script_hashes(transactions)
+        # Only transactions paying to one of those addresses can yield anything
+        candidates = [
+            tx for tx in transactions
+            if any(o.get("address") in script_for_address for o in tx.get("outputs", ()))
+        ] if script_for_address else []
+        if not candidates:
+            orders, pools = [], []
+        elif self.workers > 1 and len(candidates) >= self.parallel_threshold:
+            orders, pools = self._process_parallel(candidates, script_for_address)
+        else:
+            orders, pools = self._process_transactions(candidates, script_for_address)
         
+        self.stats["transactions_processed"] += len(transactions)
         self.stats["blocks_processed"] += 1
         self.stats["orders_found"] += len(orders)
         self.stats["pools_found"] += len(pools)
@@ -65,82 +119,129 @@ class BlockProcessor:
             "stats": self.stats.copy(),
         }
     
-    def _process_transaction(self, block: Dict, tx_idx: int, tx: Dict) -> tuple[List, List]:
-        """Process a single transaction."""
-        orders = []
-        pools = []
-        
-        # Check outputs for orders/pools
-        for output_idx, output in enumerate(tx.get("outputs", [])):
-            address = output.get("address", "")
-            value = output.get("value", {})
-            datum_cbor_hex = output.get("datum")
-            
-            if not datum_cbor_hex:
-                continue
-            
-            utxo_id = f"{tx['id']}#{output_idx}"
-            utxo = {
-                "tx_hash": tx["id"],
-                "output_index": output_idx,
-                "address": address,
-                "value": value,
-                "datum_cbor": datum_cbor_hex,
-            }
-            
-            # Extract script hash from address for order detection
-            # Check known order addresses first
-            if address in ORDER_ADDRESS_TO_SCRIPT:
-                utxo["script_hash"] = ORDER_ADDRESS_TO_SCRIPT[address]
-            else:
-                # Try to extract from address
-                try:
-                    addr = Address.decode(address)
-                    # For script addresses, payment_part is ScriptHash
-                    if hasattr(addr.payment_part, 'payload'):
-                        script_hash = addr.payment_part.payload.hex()
-                        utxo["script_hash"] = script_hash
-                except Exception:
-                    pass  # Not a script address or decode failed
-            
-            # Try to parse as order
-            for parser in self.order_parsers.values():
-                if parser.is_order_utxo(utxo):
-                    try:
-                        datum_cbor = bytes.fromhex(datum_cbor_hex)
-                        order = parser.parse_order(utxo, datum_cbor, utxo_id)
-                        if order:
-                            orders.append({
-                                "utxo_id": utxo_id,
-                                "order_type": order.order_type,
-                                "bid_token": order.bid_token.to_hex() if hasattr(order.bid_token, 'to_hex') else str(order.bid_token),
-                                "ask_token": order.ask_token.to_hex() if hasattr(order.ask_token, 'to_hex') else str(order.ask_token),
-                                "bid_amount": order.bid_amount,
-                                "ask_amount": order.ask_amount,
-                            })
-                            break  # Found order, don't try other parsers
-                    except Exception as e:
-                        logger.debug(f"Failed to parse order {utxo_id}: {e}")
-                    break  # Tried this parser, move on
-            
-            # Try to parse as pool (check for NFT)
-            for handler in self.pool_handlers.values():
-                if handler.is_pool_utxo(utxo):
-                    try:
-                        datum_cbor = bytes.fromhex(datum_cbor_hex)
-                        pool = handler.parse_pool(utxo, datum_cbor, utxo_id)
-                        if pool:
-                            pools.append({
-                                "utxo_id": utxo_id,
-                                "pool_type": pool.pool_type,
-                                "token_a": pool.token_a.to_hex() if hasattr(pool.token_a, 'to_hex') else str(pool.token_a),
-                                "token_b": pool.token_b.to_hex() if hasattr(pool.token_b, 'to_hex') else str(pool.token_b),
-                                "reserve_a": pool.reserve_a,
-                                "reserve_b": pool.reserve_b,
-                            })
-                            break  # Found pool, don't try other handlers
-                    except Exception as e:
-                        logger.debug(f"Failed to parse pool {utxo_id}: {e}")
-                    break
+    def _resolve_script_hashes(self, transactions: List[Dict]) -> Dict[str, str]:
+        """Map addresses of datum-carrying outputs to script hashes that a parser/handler owns."""
+        addresses = {o.get("address", "") for tx in transactions for o in tx.get("outputs", []) if o.get("datum")}
+        resolved = {}
+        for address in addresses:
+            script_hash = ORDER_ADDRESS_TO_SCRIPT.get(address) or _decode_script_hash(address)
+            if script_hash and (self._parser_for_script(script_hash) or self._handler_for_script(script_hash)):
+                resolved[address] = script_hash
+        return resolved
+    
+    def _process_parallel(self, transactions: List[Dict], script_for_address: Dict[str, str]) -> tuple[List, List]:
+        """Fan transactions out to the worker pool in contiguous slices, keeping block order."""
+        if self._executor is None:
+            # process_block may run off the main thread (e.g. via run_in_executor); forking a
+            # multi-threaded process can deadlock the child, so never use the fork start method
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context(_POOL_START_METHOD),
+                initializer=_init_worker,
+            )
+        size = -(-len(transactions) // self.workers)
+        slices = [transactions[i:i + size] for i in range(0, len(transactions), size)]
+        try:
+            results = list(self._executor.map(_process_slice, slices, [script_for_address] * len(slices)))
+        except BrokenProcessPool as e:
+            logger.warning(f"Worker pool failed, processing serially: {e}")
+            self.close()
+            return self._process_transactions(transactions, script_for_address)
         
+        orders, pools = [], []
+        for slice_orders, slice_pools in results:
+            orders.extend(slice_orders)
+            pools.extend(slice_pools)
+        return orders, pools
+    
+    def _process_transactions(self, transactions: List[Dict], script_for_address: Dict[str, str]) -> tuple[List, List]:
+        # Every transaction appends straight into the block-level lists
+        orders, pools = [], []
+        for tx in transactions:
+            _extract_from_outputs(
+                tx.get("outputs", []), tx["id"], script_for_address, self._parser_for_script, self._handler_for_script,
+                orders, pools,
+            )
         return orders, pools
+
+
+def _extract_from_outputs(
+    outputs: List[Dict],
+    tx_id: str,
+    script_for_address: Dict[str, str],
+    parser_for_script: Callable[[str], Optional[OrderParser]],
+    handler_for_script: Callable[[str], Optional[PoolHandler]],
+    orders: List[OrderRecord],
+    pools: List[PoolRecord],
+):
+    """
+    Append order/pool records from one transaction's outputs to orders/pools.
+    
+    Plain function over plain arguments (no self), so the per-output loop binds
+    only locals and stays amenable to compilers like mypyc.
+    """
+    # Check outputs for orders/pools
+    for output_idx, output in enumerate(outputs):
+        # Most outputs are plain payments without a datum; bail before any other work
+        datum_cbor_hex = output.get("datum")
+        if not datum_cbor_hex:
+            continue
+        
+        # Only addresses owned by a parser/handler were resolved for this block
+        address = output.get("address", "")
+        script_hash = script_for_address.get(address)
+        if not script_hash:
+            continue
+        parser = parser_for_script(script_hash)
+        handler = handler_for_script(script_hash)
+        
+        utxo_id = f"{tx_id}#{output_idx}"
+        # Decode the datum once for every parser/handler below
+        try:
+            datum_cbor = bytes.fromhex(datum_cbor_hex)
+        except ValueError:
+            logger.debug("Invalid datum hex in %s", utxo_id)
+            continue
+        utxo = {
+            "tx_hash": tx_id,
+            "output_index": output_idx,
+            "address": address,
+            "value": output.get("value", {}),
+            "datum_cbor": datum_cbor,
+            "script_hash": script_hash,
+        }
+        
+        if parser and parser.is_order_utxo(utxo):
+            try:
+                order = parser.parse_order(utxo, datum_cbor, utxo_id)
+                if order:
+                    orders.append(OrderRecord(
+                        utxo_id, order.order_type, order.bid_token.to_hex(), order.ask_token.to_hex(),
+                        order.bid_asset.amount, order.ask_asset.amount,
+                    ))
+            except Exception as e:
+                logger.debug("Failed to parse order %s: %s", utxo_id, e)
+        
+        # Pools must also hold their NFT
+        if handler and handler.is_pool_utxo(utxo):
+            try:
+                pool = handler.parse_pool(utxo, datum_cbor, utxo_id)
+                if pool:
+                    pools.append(PoolRecord(
+                        utxo_id, pool.pool_type, pool.token_a.to_hex(), pool.token_b.to_hex(),
+                        pool.reserve_a, pool.reserve_b,
+                    ))
+            except Exception as e:
+                logger.debug("Failed to parse pool %s: %s", utxo_id, e)
+
+
+# Worker-process side of BlockProcessor._process_parallel
+_worker_processor: Optional[BlockProcessor] = None
+
+
+def _init_worker():
+    global _worker_processor
+    _worker_processor = BlockProcessor(workers=1)
+
+
+def _process_slice(transactions: List[Dict], script_for_address: Dict[str, str]) -> tuple[List, List]:
+    return _worker_processor._process_transactions(transactions, script_for_address)
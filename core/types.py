@@ -4,11 +4,16 @@ Core types for the arbitrage bot.
 Minimal Token and Asset types. Uses pycardano for everything else.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 
 
-@dataclass(frozen=True)
+# Interned tokens by (policy_id, name) hex and by raw datum bytes; see Token.get/from_bytes
+_TOKEN_CACHE: Dict[Tuple[str, str], "Token"] = {}
+_TOKEN_BYTES_CACHE: Dict[Tuple[bytes, bytes], "Token"] = {}
+
+
+@dataclass(frozen=True, slots=True)
 class Token:
     """
     Represents a Cardano native token.
@@ -18,14 +23,47 @@ class Token:
     """
     policy_id: str
     name: str  # hex encoded
+    # Derived once at construction; tokens are compared/hashed in tight loops
+    subject: str = field(init=False, repr=False, compare=False)  # policy_id + name
+    is_ada: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        subject = self.policy_id + self.name
+        object.__setattr__(self, "subject", subject)
+        object.__setattr__(self, "is_ada", not subject)
+    
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is not Token:
+            return NotImplemented
+        return self.policy_id == other.policy_id and self.name == other.name
+    
+    def __hash__(self) -> int:
+        # Not stored: str hashes are per-process, and str caches its own hash anyway
+        return hash((self.policy_id, self.name))
+    
+    @classmethod
+    def get(cls, policy_id: str, name: str) -> "Token":
+        """Interned Token for (policy_id, name), so hot comparisons hit the identity check."""
+        key = (policy_id, name)
+        token = _TOKEN_CACHE.get(key)
+        if token is None:
+            token = _TOKEN_CACHE.setdefault(key, cls(policy_id=policy_id, name=name))
+        return token
     
-    @property
-    def is_ada(self) -> bool:
-        return self.policy_id == "" and self.name == ""
+    @classmethod
+    def from_bytes(cls, policy_id: bytes, name: bytes) -> "Token":
+        """Interned Token from raw datum bytes; repeat hits skip the hex conversion."""
+        key = (policy_id, name)
+        token = _TOKEN_BYTES_CACHE.get(key)
+        if token is None:
+            token = _TOKEN_BYTES_CACHE[key] = cls.get(policy_id.hex(), name.hex())
+        return token
     
     @classmethod
     def ada(cls) -> "Token":
-        return cls(policy_id="", name="")
+        return cls.get("", "")
     
     @classmethod
     def from_hex(cls, hex_str: str) -> "Token":
@@ -33,23 +71,30 @@ class Token:
         Create from concatenated hex string (policy_id + name).
         Policy ID is always 56 hex chars (28 bytes).
         """
-        if not hex_str or hex_str == "lovelace" or hex_str == ".":
+        if not hex_str or hex_str == "lovelace":
             return cls.ada()
         # Handle format with dot separator
         if "." in hex_str:
-            hex_str = hex_str.replace(".", "")
-        if len(hex_str) <= 56:
-            return cls(policy_id=hex_str, name="")
-        return cls(policy_id=hex_str[:56], name=hex_str[56:])
+            policy_id, _, name = hex_str.partition(".")
+            return cls.get(policy_id, name)
+        return cls.get(hex_str[:56], hex_str[56:])
+    
+    def to_hex(self) -> str:
+        """Concatenated policy_id + name (empty for ADA); inverse of from_hex."""
+        return self.subject
     
     def __str__(self) -> str:
         if self.is_ada:
             return "ADA"
         try:
-            decoded = bytes.fromhex(self.name).decode("utf-8")
-            return f"{self.policy_id[:8]}..{decoded}"
-        except (ValueError, UnicodeDecodeError):
+            raw = bytes.fromhex(self.name)
+        except ValueError:
             return f"{self.policy_id[:8]}..{self.name[:8]}"
+        # Binary asset names are common; detect them without raising UnicodeDecodeError
+        decoded = raw.decode("utf-8", errors="replace")
+        if "\ufffd" in decoded:
+            return f"{self.policy_id[:8]}..{self.name[:8]}"
+        return f"{self.policy_id[:8]}..{decoded}"
     
     def __repr__(self) -> str:
         if self.is_ada:
@@ -57,7 +102,7 @@ class Token:
         return f"Token({self.policy_id[:8]}..{self.name[:8] if self.name else ''})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Asset:
     """Token with amount."""
     amount: int
@@ -67,5 +112,27 @@ class Asset:
         return f"{self.amount} {self.token}"
 
 
+@dataclass(slots=True)
+class OrderRecord:
+    """Order found in a block, flattened for storage/reporting (tokens as hex subjects)."""
+    utxo_id: str
+    order_type: str
+    bid_token_hex: str
+    ask_token_hex: str
+    bid_amount: int
+    ask_amount: int
+
+
+@dataclass(slots=True)
+class PoolRecord:
+    """Pool state found in a block, flattened for storage/reporting (tokens as hex subjects)."""
+    utxo_id: str
+    pool_type: str
+    token_a_hex: str
+    token_b_hex: str
+    reserve_a: int
+    reserve_b: int
+
+
 # Common tokens
 ADA = Token.ada()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Offline checks for the pool table and batch pool helpers (no Ogmios needed)."""
+
+import sys
+import traceback
+
+from core.orders import MinswapV1Order, SimulationCache
+from core.pools import MinswapV1Pool, PoolTable, minswap_v1_best_pool, minswap_v1_pool_out_many
+from core.types import ADA, Asset, Token
+
+MIN = Token.get("29d222ce763455e3d7a09a665ce554f00ac89d2e99a1a83d267170c6", "4d494e")
+SNEK = Token.get("279c909f348e533da5808898f87f9a14bb2c3dfbbacccd631d927a3f", "534e454b")
+
+
+def make_pool(pool_id: str, token_b: Token, reserve_a: int, reserve_b: int) -> MinswapV1Pool:
+    return MinswapV1Pool(pool_id, ADA, token_b, reserve_a, reserve_b, f"{pool_id}#0")
+
+
+def test_pool_table():
+    table = PoolTable()
+    p1 = make_pool("p1", MIN, 1_000_000, 2_000_000)
+    p2 = make_pool("p2", SNEK, 3_000_000, 4_000_000)
+    p3 = make_pool("p3", MIN, 5_000_000, 6_000_000)
+    for pool in (p1, p2, p3):
+        table.upsert(pool)
+    assert len(table) == 3 and "p2" in table
+
+    # Upsert of a known pool overwrites its row in place
+    p1_new = make_pool("p1", MIN, 1_500_000, 1_500_000)
+    table.upsert(p1_new)
+    assert len(table) == 3 and table.get("p1") is p1_new and table.reserve_a[0] == 1_500_000
+
+    # Removing a middle row swaps the last row in; lookups must follow it
+    assert table.remove("p2") is p2
+    assert table.remove("p2") is None
+    assert len(table) == 2 and "p2" not in table
+    assert table.get("p3") is p3 and table.get("p1") is p1_new
+    assert table.pools.index(p3) == 1 and table.reserve_b[1] == 6_000_000
+
+    # Removing the last row needs no swap
+    assert table.remove("p3") is p3 and len(table) == 1 and table.get("p1") is p1_new
+    table.upsert(p3)
+
+    # Reserves come back oriented from the input token's side
+    pools, reserves = table.reserves_for(MIN)
+    assert pools == [p1_new, p3] and reserves == [(1_500_000, 1_500_000), (6_000_000, 5_000_000)]
+    pools, reserves = table.reserves_for(ADA)
+    assert reserves == [(1_500_000, 1_500_000), (5_000_000, 6_000_000)]
+    assert table.reserves_for(SNEK) == ([], [])
+
+
+def test_best_pool():
+    shallow = make_pool("shallow", MIN, 1_000_000, 1_000_000)
+    deep = make_pool("deep", MIN, 100_000_000, 100_000_000)
+    pools = [shallow, deep]
+
+    outputs = minswap_v1_pool_out_many(pools, ADA, 500_000)
+    assert outputs == [p.pool_out(ADA, 500_000) for p in pools]
+    assert minswap_v1_best_pool(pools, ADA, 500_000) == (deep, outputs[1])
+    assert minswap_v1_best_pool([], ADA, 500_000) is None
+
+
+def test_simulation_cache():
+    pool = make_pool("p1", MIN, 10_000_000, 10_000_000)
+    order = MinswapV1Order(
+        order_id="o1", bid_asset=Asset(1_000_000, ADA), ask_asset=Asset(800_000, MIN),
+        batcher_fee=2_000_000, deposit=2_000_000, sender=("addr", None), beneficiary=("addr", None),
+        utxo_id="o1#0",
+    )
+    cache = SimulationCache()
+    first = cache.simulate(order, pool)
+    assert first == order.simulate(pool) and cache.simulate(order, pool) is first
+    assert cache.would_satisfy(order, pool)
+
+    # Reserves updated in place must not be served from the cache
+    pool.reserve_b = 1_000_000
+    assert cache.simulate(order, pool) == order.simulate(pool) != first
+    assert not cache.would_satisfy(order, pool)
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+def main() -> bool:
+    ok = True
+    for check in (test_pool_table, test_best_pool, test_simulation_cache):
+        try:
+            check()
+            print(f"✅ {check.__name__}")
+        except Exception:
+            ok = False
+            print(f"❌ {check.__name__}")
+            traceback.print_exc()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
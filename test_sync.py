@@ -28,6 +28,8 @@ async def test_latest_blocks(num_blocks: int = 5):
         print("❌ Failed to connect to Ogmios")
         return False
     
+    iterator = None
+    processor = None
     try:
         # Get chain tip
         tip = await ogmios.get_chain_tip()
@@ -38,14 +40,17 @@ async def test_latest_blocks(num_blocks: int = 5):
         iterator = BlockIterator(ogmios)
         await iterator.init_connection()  # Start from latest
         
-        # Process blocks
-        processor = BlockProcessor()
+        # Process blocks (serially: process_block runs in a thread below, so no worker pool)
+        processor = BlockProcessor(workers=1)
         
         print(f"Processing {num_blocks} blocks...")
         print()
         
+        # Blocks are prefetched by the iterator; processing off the event loop lets
+        # the websocket keep reading while we parse
+        loop = asyncio.get_running_loop()
         async for block in iterator.iterate_blocks(max_blocks=num_blocks):
-            result = processor.process_block(block)
+            result = await loop.run_in_executor(None, processor.process_block, block)
             
             print(f"Block {result['block']['height']} (slot {result['block']['slot']:,})")
             print(f"  Orders: {len(result['orders'])}")
@@ -54,14 +59,14 @@ async def test_latest_blocks(num_blocks: int = 5):
             if result['orders']:
                 print("  Sample orders:")
                 for order in result['orders'][:3]:
-                    print(f"    - {order['bid_token'][:16]} → {order['ask_token'][:16]}: "
-                          f"{order['bid_amount']:,} → {order['ask_amount']:,}")
+                    print(f"    - {order.bid_token_hex[:16]} → {order.ask_token_hex[:16]}: "
+                          f"{order.bid_amount:,} → {order.ask_amount:,}")
             
             if result['pools']:
                 print("  Sample pools:")
                 for pool in result['pools'][:3]:
-                    print(f"    - {pool['token_a'][:16]}/{pool['token_b'][:16]}: "
-                          f"{pool['reserve_a']:,}/{pool['reserve_b']:,}")
+                    print(f"    - {pool.token_a_hex[:16]}/{pool.token_b_hex[:16]}: "
+                          f"{pool.reserve_a:,}/{pool.reserve_b:,}")
             
             print()
         
@@ -88,6 +93,10 @@ async def test_latest_blocks(num_blocks: int = 5):
         logger.exception("Sync failed")
         return False
     finally:
+        if iterator:
+            await iterator.close()
+        if processor:
+            processor.close()
         await ogmios.disconnect()
 
 